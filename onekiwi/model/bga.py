@@ -1,6 +1,77 @@
 import pcbnew
 import math
 import logging
+import operator
+import numpy as np
+
+# Pre-bound PAD accessors: map() with a methodcaller skips the per-pad
+# method lookup that pad.GetPosition()/pad.GetNetCode() would pay.
+_get_pos = operator.methodcaller('GetPosition')
+_get_net = operator.methodcaller('GetNetCode')
+
+# Which of the four candidate endpoints (x1..x4) each quadrant takes, per
+# 45-degree wedge of footprint angle: one row per wedge, columns are
+# (bottom-left, bottom-right, top-left, top-right) candidate indices.
+_QUADRANT_CHOICES = (
+    (1, 2, 3, 0),  # 0..45   and -180..-135
+    (0, 2, 3, 1),  # 45..90  and -135..-90
+    (3, 1, 0, 2),  # 90..135 and -90..-45
+    (2, 1, 0, 3),  # 135..180 and -45..0
+)
+
+def _quadrant_other_ends(xs, ys, x0, y0, radian, radian_pad, pitch, degrees):
+    """
+    Geometry kernel for quadrant fanout at arbitrary angles: given all pad
+    coordinates as float arrays, return the (ex, ey) endpoint arrays.
+    Pure array math, kept free of any pcbnew/SWIG calls so the whole BGA
+    is solved in a few NumPy kernels instead of per-pad Python loops.
+    """
+    anphalx = (-1) * math.tan(radian)
+    anphaly = 1 / math.tan(radian)
+    bx0 = y0 - anphalx * x0
+    by0 = y0 - anphaly * x0
+
+    pax = -1 * math.tan(radian_pad)
+    pay = 1 / math.tan(radian_pad)
+
+    # The old quadratic solved "circle of radius pitch around the pad
+    # meets the rotated grid line through the pad". The line passes
+    # through the circle center, so the roots collapse to a fixed step
+    # of pitch / sqrt(1 + slope^2) along x - the same for every pad.
+    step_x = pitch / math.hypot(1, pax)
+    step_y = pitch / math.hypot(1, pay)
+
+    x1 = xs + step_x
+    x2 = xs - step_x
+    x3 = xs + step_y
+    x4 = xs - step_y
+
+    y1 = ys + pax * step_x
+    y2 = ys - pax * step_x
+    y3 = ys + pay * step_y
+    y4 = ys - pay * step_y
+
+    # The candidate each quadrant takes depends only on which 45-degree
+    # wedge the footprint angle falls in: bucket it once and look the
+    # choices up instead of walking a chain of range comparisons.
+    candidates_x = (x1, x2, x3, x4)
+    candidates_y = (y1, y2, y3, y4)
+    case_id = int((degrees % 360) // 45) % 4
+    bl_i, br_i, tl_i, tr_i = _QUADRANT_CHOICES[case_id]
+    bl = (candidates_x[bl_i], candidates_y[bl_i])
+    br = (candidates_x[br_i], candidates_y[br_i])
+    tl = (candidates_x[tl_i], candidates_y[tl_i])
+    tr = (candidates_x[tr_i], candidates_y[tr_i])
+
+    # Side tests against the two rotated center lines pick the quadrant.
+    bottom = ys > anphalx * xs + bx0
+    left = ys > anphaly * xs + by0
+
+    ex = np.where(bottom, np.where(left, bl[0], br[0]),
+                  np.where(left, tl[0], tr[0]))
+    ey = np.where(bottom, np.where(left, bl[1], br[1]),
+                  np.where(left, tl[1], tr[1]))
+    return ex, ey
 
 class BGA:
     def __init__(self, board, reference, track, via, alignment, direction, logger):
@@ -24,15 +95,27 @@ class BGA:
         # Pitch values (in KiCad internal units)
         self.pitchx = 0
         self.pitchy = 0
+        # Half the diagonal pitch, cached by init_data for the 45-degree
+        # and other-angle fanouts
+        self.pitch_diag = 0.0
 
-        # We store references to newly added tracks and vias so we can remove them later if needed
+        # We store references to newly added tracks and vias so we can remove them later if needed.
+        # fanout() preallocates the list; _tracks_idx is the fill cursor.
         self.tracks = []
+        self._tracks_idx = 0
 
-        self.logger.info(f"Initializing BGA for reference: {reference}")
+        # Active BOARD_COMMIT while a fanout is running (None otherwise)
+        self._commit = None
+
+        self.logger.info("Initializing BGA for reference: %s", reference)
+
+        # Cache the major-version check: add_track/add_via would otherwise
+        # redo the Version() SWIG call and string split for every pad.
+        self._is_v7 = (self.get_major_version() == '7')
 
         # Find the footprint and read orientation
         self.footprint = self.board.FindFootprintByReference(reference)
-        if self.get_major_version() == '7':
+        if self._is_v7:
             self.radian = self.footprint.GetOrientation()
         else:
             self.radian = self.footprint.GetOrientationRadians()
@@ -45,15 +128,55 @@ class BGA:
         self.x0 = self.footprint.GetPosition().x
         self.y0 = self.footprint.GetPosition().y
 
+        # Intercepts of the two 45-degree diagonals through the center,
+        # used by the quadrant and x-pattern side tests
+        self._bx = self.y0 + self.x0
+        self._by = self.y0 - self.x0
+
+        # Half pitches, filled in by init_data once the pitch is known
+        self._hx = 0.0
+        self._hy = 0.0
+
         # We’ll populate self.real_pads with only “electrical” pads in init_data
         self.real_pads = []
 
+        # Structure-of-arrays view of the real pads, filled in by
+        # cache_pad_data(): positions/net codes are read through SWIG once
+        # and the geometry then works on contiguous NumPy arrays.
+        self.pad_pos = []
+        self.pad_net = []
+        self.pad_x = None
+        self.pad_y = None
+
         # The radian_pad is used for certain angle corrections
         self.radian_pad = 0.0
 
         # Initialize the data (filter out mechanical pins, compute pitch)
         self.init_data()
 
+        # Alignment and angle bucket fully determine which fanout method
+        # runs, so resolve it once here instead of re-walking the
+        # comparison cascade on every fanout() call.
+        if self.degrees in (0.0, 90.0, 180.0, -90.0):
+            bucket = 'ortho'
+        elif self.degrees in (45.0, 135.0, -135.0, -45.0):
+            bucket = '45'
+        else:
+            bucket = 'other'
+        table = {
+            ('Quadrant', 'ortho'): self.quadrant_0_90_180,
+            ('Quadrant', '45'): self.quadrant_45_135,
+            ('Quadrant', 'other'): self.quadrant_other_angle,
+            ('Diagonal', 'ortho'): self.diagonal_0_90_180,
+            ('Diagonal', '45'): self.diagonal_45_135,
+            ('X-pattern', 'ortho'): self.xpattern_0_90_180,
+            ('X-pattern', '45'): self.xpattern_45_135,
+            ('X-pattern', 'other'): self.xpattern_other_angle,
+        }
+        # Diagonal at other angles has no implementation yet, so that key
+        # is simply absent and fanout() logs it.
+        self._fanout_impl = table.get((self.alignment, bucket))
+
     def get_major_version(self):
         version_str = str(pcbnew.Version())
         return version_str.split(".")[0]
@@ -69,10 +192,14 @@ class BGA:
         # 1) Filter out mechanical pins: only keep pads that have a valid net
         #    (i.e. NetCode != 0).
         self.real_pads = []
+        # Check the log level once: GetPadName() is a SWIG call and the
+        # message formatting is wasted work when debug logging is off.
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         for pad in self.all_pads:
             if pad.GetNetCode() == 0:
                 # This is likely a mechanical alignment pin / hole, skip it
-                self.logger.debug(f"Skipping mechanical pin: {pad.GetPadName()}")
+                if debug_enabled:
+                    self.logger.debug("Skipping mechanical pin: %s", pad.GetPadName())
                 continue
             self.real_pads.append(pad)
 
@@ -85,97 +212,102 @@ class BGA:
         if self.degrees not in [0.0, 90.0, 180.0, -90.0]:
             temp_degrees = self.degrees + 45.0
             self.footprint.SetOrientationDegrees(temp_degrees)
-            if self.get_major_version() == '7':
+            if self._is_v7:
                 self.radian_pad = self.footprint.GetOrientation()
             else:
                 self.radian_pad = self.footprint.GetOrientationRadians()
             # Now set to 0 for measuring
             self.footprint.SetOrientationDegrees(0)
 
-        # 3) Group pads into rows/columns
-        pos_x = []
-        pos_y = []
-
-        # Start the grouping arrays with the first real pad
-        first_pos = self.real_pads[0].GetPosition()
-        pos_x.append([first_pos])
-        pos_y.append([first_pos])
-
-        # Prepare bounding box min/max from that first pad
-        minx = first_pos.x
-        maxx = first_pos.x
-        miny = first_pos.y
-        maxy = first_pos.y
-
-        # Loop over all real pads
+        # 3) Pull every pad position into two flat arrays so the grouping
+        #    and pitch search below run as NumPy kernels instead of
+        #    Python-level loops over wxPoint lists.
+        #    Coincident pads would only contribute zero-length steps, so
+        #    drop duplicate positions up front with one hashed set lookup
+        #    per pad (O(N) instead of a linear scan per pad).
+        seen = set()
+        unique_x = []
+        unique_y = []
         for pad in self.real_pads:
             pos = pad.GetPosition()
+            key = (pos.x, pos.y)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique_x.append(pos.x)
+            unique_y.append(pos.y)
+        xs = np.array(unique_x, dtype=np.int64)
+        ys = np.array(unique_y, dtype=np.int64)
+
+        # 4) Pitch X: sort pads row-major (same Y = same row, then by X) and
+        #    take the smallest positive X step inside any row.
+        pitchx = self.min_step_in_groups(xs, ys)
+
+        # Pitch Y: same thing column-major (same X = same column, then by Y)
+        pitchy = self.min_step_in_groups(ys, xs)
 
-            # Update min/max bounding box
-            if pos.x < minx: minx = pos.x
-            if pos.x > maxx: maxx = pos.x
-            if pos.y < miny: miny = pos.y
-            if pos.y > maxy: maxy = pos.y
-
-            checkx = True
-            for arr in pos_x:
-                # If they share the same Y, we consider them in the same "row"
-                if arr[0].y == pos.y and pos not in arr:
-                    arr.append(pos)
-                    checkx = False
-                    break
-            if checkx:
-                pos_x.append([pos])
-
-            checky = True
-            for arr in pos_y:
-                # If they share the same X, we consider them in the same "column"
-                if arr[0].x == pos.x and pos not in arr:
-                    arr.append(pos)
-                    checky = False
-                    break
-            if checky:
-                pos_y.append([pos])
-
-        # Sort each row by X, and each column by Y
-        for arrs in pos_x:
-            arrs.sort(key=lambda p: p.x)
-        for arrs in pos_y:
-            arrs.sort(key=lambda p: p.y)
-
-        # 4) Compute pitch if the first row & column have at least 2 pads
-        if len(pos_x[0]) < 2:
-            self.logger.info("First row in pos_x has fewer than 2 pads; skipping pitch calculation.")
+        if pitchx is None:
+            self.logger.info("No row with 2 or more pads; skipping pitch calculation.")
             return
-        if len(pos_y[0]) < 2:
-            self.logger.info("First column in pos_y has fewer than 2 pads; skipping pitch calculation.")
+        if pitchy is None:
+            self.logger.info("No column with 2 or more pads; skipping pitch calculation.")
             return
 
-        # Pitch X = difference between first two pads in the first row
-        self.pitchx = pos_x[0][1].x - pos_x[0][0].x
-        for row in pos_x:
-            for i in range(1, len(row)):
-                pitch_candidate = row[i].x - row[i - 1].x
-                if 0 < pitch_candidate < self.pitchx:
-                    self.pitchx = pitch_candidate
-
-        # Pitch Y = difference between first two pads in the first column
-        self.pitchy = pos_y[0][1].y - pos_y[0][0].y
-        for col in pos_y:
-            for i in range(1, len(col)):
-                pitch_candidate = col[i].y - col[i - 1].y
-                if 0 < pitch_candidate < self.pitchy:
-                    self.pitchy = pitch_candidate
+        self.pitchx = pitchx
+        self.pitchy = pitchy
+        self.pitch_diag = math.hypot(pitchx, pitchy) / 2
+        self._hx = pitchx / 2
+        self._hy = pitchy / 2
 
         # Convert to mm and log
         IU_PER_MM = 1000000
         px_mm = round(self.pitchx / IU_PER_MM, 4)
         py_mm = round(self.pitchy / IU_PER_MM, 4)
-        self.logger.info(f"pitch x: {px_mm} mm, pitch y: {py_mm} mm")
+        self.logger.info("pitch x: %s mm, pitch y: %s mm", px_mm, py_mm)
 
         # 5) Restore the original rotation
         self.footprint.SetOrientationDegrees(self.degrees)
 
+        # 6) Cache the pad data now that the footprint is back in place
+        self.cache_pad_data()
+
+    def cache_pad_data(self):
+        """
+        Cache position, net code and coordinate arrays for the real pads.
+        Every fanout method reads these instead of going back through the
+        SWIG accessors per pad.
+        """
+        count = len(self.real_pads)
+        self.pad_pos = list(map(_get_pos, self.real_pads))
+        self.pad_net = list(map(_get_net, self.real_pads))
+        self.pad_x = np.fromiter((pos.x for pos in self.pad_pos),
+                                 dtype=np.int64, count=count)
+        self.pad_y = np.fromiter((pos.y for pos in self.pad_pos),
+                                 dtype=np.int64, count=count)
+
+    def min_step_in_groups(self, values, keys):
+        """
+        Group 'values' by equal 'keys' (e.g. X positions grouped by row Y),
+        sort each group, and return the smallest positive step between
+        neighbours in any group, or None if no group has 2+ distinct values.
+        Runs on NumPy arrays so the whole search is a few C-level kernels.
+        """
+        if len(values) < 2:
+            return None
+
+        order = np.lexsort((values, keys))
+        sorted_values = values[order]
+        sorted_keys = keys[order]
+
+        # One diff across the whole sorted sequence; steps that straddle
+        # a group boundary are masked out, so there is no per-group loop.
+        diffs = np.diff(sorted_values)
+        same_group = sorted_keys[1:] == sorted_keys[:-1]
+        diffs = diffs[same_group & (diffs > 0)]
+        if diffs.size == 0:
+            return None
+        return int(diffs.min())
+
     def fanout(self):
         """
         Route each pad outward. This code references self.real_pads,
@@ -185,27 +317,34 @@ class BGA:
             self.logger.info("Not enough real pads to fan out.")
             return
 
-        if self.alignment == 'Quadrant':
-            if self.degrees in [0.0, 90.0, 180.0, -90.0]:
-                self.quadrant_0_90_180()
-            elif self.degrees in [45.0, 135.0, -135.0, -45.0]:
-                self.quadrant_45_135()
-            else:
-                self.quadrant_other_angle()
-        elif self.alignment == 'Diagonal':
-            if self.degrees in [0.0, 90.0, 180.0, -90.0]:
-                self.diagonal_0_90_180()
-            elif self.degrees in [45.0, 135.0, -135.0, -45.0]:
-                self.diagonal_45_135()
-            else:
-                self.diagonal_other_angle()
-        elif self.alignment == 'X-pattern':
-            if self.degrees in [0.0, 90.0, 180.0, -90.0]:
-                self.xpattern_0_90_180()
-            elif self.degrees in [45.0, 135.0, -135.0, -45.0]:
-                self.xpattern_45_135()
-            else:
-                self.xpattern_other_angle()
+        # init_data may have bailed out early; make sure the arrays exist
+        if self.pad_x is None:
+            self.cache_pad_data()
+
+        if self._fanout_impl is None:
+            self.logger.info("No fanout implementation for alignment '%s' at %s degrees.",
+                             self.alignment, self.degrees)
+            return
+
+        # Batch the additions through one BOARD_COMMIT where the running
+        # KiCad exposes it, so the board bookkeeping is amortized over
+        # the whole fanout instead of paid per track/via.
+        if hasattr(pcbnew, 'BOARD_COMMIT'):
+            self._commit = pcbnew.BOARD_COMMIT(self.board)
+
+        # Preallocate the undo list: each pad adds at most one track and
+        # one via, so fill by index instead of growing with append and
+        # trim whatever was skipped afterwards.
+        self.tracks = [None] * (2 * len(self.real_pads))
+        self._tracks_idx = 0
+
+        try:
+            self._fanout_impl()
+            if self._commit is not None:
+                self._commit.Push("BGA fanout")
+        finally:
+            self._commit = None
+            del self.tracks[self._tracks_idx:]
 
         pcbnew.Refresh()
         self.logger.debug("Fanout complete.")
@@ -215,230 +354,81 @@ class BGA:
     # ----------------------------------------------------------------
 
     def quadrant_0_90_180(self):
-        for pad in self.real_pads:
-            pos = pad.GetPosition()
-            net = pad.GetNetCode()
-            if pos.y > self.y0:
-                if pos.x > self.x0:
-                    # bottom-right quadrant
-                    x = pos.x + self.pitchx / 2
-                    y = pos.y + self.pitchy / 2
-                else:
-                    # bottom-left quadrant
-                    x = pos.x - self.pitchx / 2
-                    y = pos.y + self.pitchy / 2
-            else:
-                if pos.x > self.x0:
-                    # top-right quadrant
-                    x = pos.x + self.pitchx / 2
-                    y = pos.y - self.pitchy / 2
-                else:
-                    # top-left quadrant
-                    x = pos.x - self.pitchx / 2
-                    y = pos.y - self.pitchy / 2
-
-            end = pcbnew.wxPoint(x, y)
-            self.add_track(net, pos, end)
-            self.add_via(net, end)
+        # Compute every endpoint in one NumPy pass, so the only per-pad
+        # work left is the SWIG track/via creation in add_fanout.
+        xs = self.pad_x
+        ys = self.pad_y
+        hx = self._hx
+        hy = self._hy
+        # Branchless sign pick: copysign against the center offset instead
+        # of a mask-and-select. Written as -copysign(h, center - pad) so a
+        # pad exactly on the center line still goes left/up, matching the
+        # old "strictly greater" comparison.
+        ex = xs - np.copysign(hx, self.x0 - xs)
+        ey = ys - np.copysign(hy, self.y0 - ys)
+        self.add_fanout(ex, ey)
 
     def quadrant_45_135(self):
-        bx = self.y0 + self.x0
-        by = self.y0 - self.x0
-        pitch = math.sqrt(self.pitchx * self.pitchx + self.pitchy * self.pitchy) / 2
-
-        for pad in self.real_pads:
-            pos = pad.GetPosition()
-            net = pad.GetNetCode()
-
-            y1 = bx - pos.x
-            y2 = by + pos.x
-            if pos.y > y1:
-                if pos.y > y2:
-                    # bottom
-                    x = pos.x
-                    y = pos.y + pitch
-                else:
-                    # left
-                    x = pos.x + pitch
-                    y = pos.y
-            else:
-                if pos.y > y2:
-                    # right
-                    x = pos.x - pitch
-                    y = pos.y
-                else:
-                    # top
-                    x = pos.x
-                    y = pos.y - pitch
-
-            end = pcbnew.wxPoint(x, y)
-            self.add_track(net, pos, end)
-            self.add_via(net, end)
+        bx = self._bx
+        by = self._by
+        pitch = self.pitch_diag
+
+        xs = self.pad_x
+        ys = self.pad_y
+        # Side tests against the two 45-degree diagonals, as arrays:
+        # (m1, m2) = (True, True) bottom, (True, False) left,
+        # (False, True) right, (False, False) top.
+        m1 = ys > (bx - xs)
+        m2 = ys > (by + xs)
+        ex = xs + np.where(m1, np.where(m2, 0.0, pitch),
+                           np.where(m2, -pitch, 0.0))
+        ey = ys + np.where(m1, np.where(m2, pitch, 0.0),
+                           np.where(m2, 0.0, -pitch))
+        self.add_fanout(ex, ey)
 
     def quadrant_other_angle(self):
         """
         For footprints that are at angles other than multiples
         of 45°, do some geometry to fan out in quadrants.
         """
-        anphalx = (-1) * math.tan(self.radian)
-        anphaly = 1 / math.tan(self.radian)
-        bx0 = self.y0 - anphalx * self.x0
-        by0 = self.y0 - anphaly * self.x0
-
-        pax = -1 * math.tan(self.radian_pad)
-        pay = 1 / math.tan(self.radian_pad)
-        pitch = math.sqrt(self.pitchx * self.pitchx + self.pitchy * self.pitchy) / 2
-
-        for pad in self.real_pads:
-            pos = pad.GetPosition()
-            net = pad.GetNetCode()
-
-            y1 = anphalx * pos.x + bx0
-            y2 = anphaly * pos.x + by0
-
-            pbx = pos.y - pax * pos.x
-            pby = pos.y - pay * pos.x
-
-            # We'll compute up to four possible points (x1, x2, x3, x4) to move to
-            ax = pax * pax + 1
-            bx = 2 * pax * pbx - 2 * pos.x - 2 * pax * pos.y
-            cx = pos.x * pos.x + pbx * pbx + pos.y * pos.y - 2 * pbx * pos.y - pitch * pitch
-
-            ay = pay * pay + 1
-            by_ = 2 * pay * pby - 2 * pos.x - 2 * pay * pos.y
-            cy = pos.x * pos.x + pby * pby + pos.y * pos.y - 2 * pby * pos.y - pitch * pitch
-
-            deltax = bx * bx - 4 * ax * cx
-            deltay = by_ * by_ - 4 * ay * cy
-
-            x1 = x2 = x3 = x4 = pos.x
-            if deltax > 0:
-                sqrt_dx = math.sqrt(deltax)
-                x1 = (-(bx) + sqrt_dx) / (2 * ax)
-                x2 = (-(bx) - sqrt_dx) / (2 * ax)
-
-            if deltay > 0:
-                sqrt_dy = math.sqrt(deltay)
-                x3 = (-(by_) + sqrt_dy) / (2 * ay)
-                x4 = (-(by_) - sqrt_dy) / (2 * ay)
-
-            # We'll do quadrant decisions based on comparing pos.y with y1,y2
-
-            degrees_0to45   =  (0 < self.degrees < 45)
-            degrees_45to90  =  (45 < self.degrees < 90)
-            degrees_90to135 =  (90 < self.degrees < 135)
-            degrees_135to180=  (135 < self.degrees < 180)
-            degrees_0to90   =  (0 < self.degrees < 90)
-            degrees_90to180 =  (90 < self.degrees < 180)
-
-            degrees_n45to0  = (-45 < self.degrees < 0)
-            degrees_n90to45 = (-90 < self.degrees < -45)
-            degrees_n135to90= (-135 < self.degrees < -90)
-            degrees_n180to135=(-180 < self.degrees < -135)
-            degrees_n180to90= (-180 < self.degrees < -90)
-            degrees_n90to0  = (-90 < self.degrees < 0)
-
-            if pos.y > y1:
-                # bottom half
-                if pos.y > y2:
-                    # bottom-left
-                    if degrees_0to45 or degrees_n180to135:
-                        x = x2
-                        y = pax * x + pbx
-                    elif degrees_45to90 or degrees_n135to90:
-                        x = x1
-                        y = pax * x + pbx
-                    elif degrees_90to135 or degrees_n90to45:
-                        x = x4
-                        y = pay * x + pby
-                    elif degrees_135to180 or degrees_n45to0:
-                        x = x3
-                        y = pay * x + pby
-                else:
-                    # bottom-right
-                    if degrees_0to90 or degrees_n180to90:
-                        x = x3
-                        y = pay * x + pby
-                    elif degrees_90to180 or degrees_n90to0:
-                        x = x2
-                        y = pax * x + pbx
-            else:
-                # top half
-                if pos.y > y2:
-                    # top-left
-                    if degrees_0to90 or degrees_n180to90:
-                        x = x4
-                        y = pay * x + pby
-                    elif degrees_90to180 or degrees_n90to0:
-                        x = x1
-                        y = pax * x + pbx
-                else:
-                    # top-right
-                    if degrees_0to45 or degrees_n180to135:
-                        x = x1
-                        y = pax * x + pbx
-                    elif degrees_45to90 or degrees_n135to90:
-                        x = x2
-                        y = pax * x + pbx
-                    elif degrees_90to135 or degrees_n90to45:
-                        x = x3
-                        y = pay * x + pby
-                    elif degrees_135to180 or degrees_n45to0:
-                        x = x4
-                        y = pay * x + pby
-
-            end = pcbnew.wxPoint(x, y)
-            self.add_track(net, pos, end)
-            self.add_via(net, end)
+        ex, ey = _quadrant_other_ends(self.pad_x, self.pad_y,
+                                      self.x0, self.y0,
+                                      self.radian, self.radian_pad,
+                                      self.pitch_diag, self.degrees)
+        self.add_fanout(ex, ey)
 
     # ----------------------------------------------------------------
     # DIAGONAL Methods
     # ----------------------------------------------------------------
 
     def diagonal_0_90_180(self):
-        for pad in self.real_pads:
-            pos = pad.GetPosition()
-            net = pad.GetNetCode()
-            if self.direction == 'TopLeft':
-                x = pos.x - self.pitchx / 2
-                y = pos.y - self.pitchy / 2
-            elif self.direction == 'TopRight':
-                x = pos.x + self.pitchx / 2
-                y = pos.y - self.pitchy / 2
-            elif self.direction == 'BottomLeft':
-                x = pos.x - self.pitchx / 2
-                y = pos.y + self.pitchy / 2
-            else:
-                # 'BottomRight'
-                x = pos.x + self.pitchx / 2
-                y = pos.y + self.pitchy / 2
-
-            end = pcbnew.wxPoint(x, y)
-            self.add_track(net, pos, end)
-            self.add_via(net, end)
+        # The direction is fixed for the whole fanout, so resolve the
+        # offset once instead of re-checking the string per pad.
+        hx = self._hx
+        hy = self._hy
+        if self.direction == 'TopLeft':
+            dx, dy = -hx, -hy
+        elif self.direction == 'TopRight':
+            dx, dy = hx, -hy
+        elif self.direction == 'BottomLeft':
+            dx, dy = -hx, hy
+        else:
+            # 'BottomRight'
+            dx, dy = hx, hy
+        self.add_fanout(self.pad_x + dx, self.pad_y + dy)
 
     def diagonal_45_135(self):
-        pitch = math.sqrt(self.pitchx * self.pitchx + self.pitchy * self.pitchy) / 2
-        for pad in self.real_pads:
-            pos = pad.GetPosition()
-            net = pad.GetNetCode()
-            if self.direction == 'TopLeft':
-                x = pos.x - pitch
-                y = pos.y
-            elif self.direction == 'TopRight':
-                x = pos.x + pitch
-                y = pos.y
-            elif self.direction == 'BottomLeft':
-                x = pos.x
-                y = pos.y + pitch
-            else:
-                # 'BottomRight'
-                x = pos.x
-                y = pos.y - pitch
-
-            end = pcbnew.wxPoint(x, y)
-            self.add_track(net, pos, end)
-            self.add_via(net, end)
+        pitch = self.pitch_diag
+        if self.direction == 'TopLeft':
+            dx, dy = -pitch, 0
+        elif self.direction == 'TopRight':
+            dx, dy = pitch, 0
+        elif self.direction == 'BottomLeft':
+            dx, dy = 0, pitch
+        else:
+            # 'BottomRight'
+            dx, dy = 0, -pitch
+        self.add_fanout(self.pad_x + dx, self.pad_y + dy)
 
     '''def diagonal_other_angle(self):
         pax = -1 * math.tan(self.radian_pad)
@@ -501,99 +491,62 @@ class BGA:
     # ----------------------------------------------------------------
 
     def xpattern_0_90_180(self):
-        bx = self.y0 + self.x0
-        by = self.y0 - self.x0
-
-        for pad in self.real_pads:
-            pos = pad.GetPosition()
-            net = pad.GetNetCode()
-            y1 = bx - pos.x
-            y2 = by + pos.x
-
-            if pos.y > y1:
-                if pos.y > y2:
-                    # bottom
-                    if self.direction == 'Counterclock':
-                        x = pos.x - self.pitchx / 2
-                        y = pos.y + self.pitchy / 2
-                    else:
-                        # 'Counterclockwise'
-                        x = pos.x + self.pitchx / 2
-                        y = pos.y + self.pitchy / 2
-                else:
-                    # right
-                    if self.direction == 'Counterclock':
-                        x = pos.x + self.pitchx / 2
-                        y = pos.y + self.pitchy / 2
-                    else:
-                        x = pos.x + self.pitchx / 2
-                        y = pos.y - self.pitchy / 2
-            else:
-                if pos.y > y2:
-                    # left
-                    if self.direction == 'Counterclock':
-                        x = pos.x - self.pitchx / 2
-                        y = pos.y - self.pitchy / 2
-                    else:
-                        x = pos.x - self.pitchx / 2
-                        y = pos.y + self.pitchy / 2
-                else:
-                    # top
-                    if self.direction == 'Counterclock':
-                        x = pos.x + self.pitchx / 2
-                        y = pos.y - self.pitchy / 2
-                    else:
-                        x = pos.x - self.pitchx / 2
-                        y = pos.y - self.pitchy / 2
-
-            end = pcbnew.wxPoint(x, y)
-            self.add_track(net, pos, end)
-            self.add_via(net, end)
+        bx = self._bx
+        by = self._by
+        hx = self._hx
+        hy = self._hy
+
+        # Per-side offsets (bottom/right/left/top) only depend on the
+        # rotation direction, so resolve them before the array math.
+        if self.direction == 'Counterclock':
+            bdx, bdy = -hx, hy
+            rdx, rdy = hx, hy
+            ldx, ldy = -hx, -hy
+            tdx, tdy = hx, -hy
+        else:
+            # 'Counterclockwise'
+            bdx, bdy = hx, hy
+            rdx, rdy = hx, -hy
+            ldx, ldy = -hx, hy
+            tdx, tdy = -hx, -hy
+
+        xs = self.pad_x
+        ys = self.pad_y
+        # Side tests against the two 45-degree diagonals:
+        # (m1, m2) = (True, True) bottom, (True, False) right,
+        # (False, True) left, (False, False) top.
+        m1 = ys > (bx - xs)
+        m2 = ys > (by + xs)
+        ex = xs + np.where(m1, np.where(m2, bdx, rdx),
+                           np.where(m2, ldx, tdx))
+        ey = ys + np.where(m1, np.where(m2, bdy, rdy),
+                           np.where(m2, ldy, tdy))
+        self.add_fanout(ex, ey)
 
     def xpattern_45_135(self):
-        pitch = math.sqrt(self.pitchx * self.pitchx + self.pitchy * self.pitchy) / 2
-
-        for pad in self.real_pads:
-            pos = pad.GetPosition()
-            net = pad.GetNetCode()
-            if pos.y > self.y0:
-                if pos.x > self.x0:
-                    # bottom-right
-                    if self.direction == 'Counterclock':
-                        x = pos.x
-                        y = pos.y + pitch
-                    else:
-                        x = pos.x + pitch
-                        y = pos.y
-                else:
-                    # bottom-left
-                    if self.direction == 'Counterclock':
-                        x = pos.x - pitch
-                        y = pos.y
-                    else:
-                        x = pos.x
-                        y = pos.y + pitch
-            else:
-                if pos.x > self.x0:
-                    # top-right
-                    if self.direction == 'Counterclock':
-                        x = pos.x + pitch
-                        y = pos.y
-                    else:
-                        x = pos.x
-                        y = pos.y - pitch
-                else:
-                    # top-left
-                    if self.direction == 'Counterclock':
-                        x = pos.x
-                        y = pos.y - pitch
-                    else:
-                        x = pos.x - pitch
-                        y = pos.y
-
-            end = pcbnew.wxPoint(x, y)
-            self.add_track(net, pos, end)
-            self.add_via(net, end)
+        pitch = self.pitch_diag
+
+        # Per-quadrant offsets, resolved once from the rotation direction
+        if self.direction == 'Counterclock':
+            brdx, brdy = 0.0, pitch
+            bldx, bldy = -pitch, 0.0
+            trdx, trdy = pitch, 0.0
+            tldx, tldy = 0.0, -pitch
+        else:
+            brdx, brdy = pitch, 0.0
+            bldx, bldy = 0.0, pitch
+            trdx, trdy = 0.0, -pitch
+            tldx, tldy = -pitch, 0.0
+
+        xs = self.pad_x
+        ys = self.pad_y
+        bottom = ys > self.y0
+        right = xs > self.x0
+        ex = xs + np.where(bottom, np.where(right, brdx, bldx),
+                           np.where(right, trdx, tldx))
+        ey = ys + np.where(bottom, np.where(right, brdy, bldy),
+                           np.where(right, trdy, tldy))
+        self.add_fanout(ex, ey)
 
     def xpattern_other_angle(self):
         # The user’s original code for X-pattern at other angles
@@ -605,17 +558,42 @@ class BGA:
     # HELPER Methods for adding tracks & vias
     # ----------------------------------------------------------------
 
-    def add_track(self, net, start, end):
+    def add_fanout(self, ex, ey):
         """
-        Add a track from 'start' to 'end', skipping if zero-length.
+        Create a track from each real pad to its endpoint in (ex, ey),
+        plus a via at the endpoint. The geometry methods hand in the
+        endpoint arrays; this loop only talks to pcbnew.
         """
-        # If start == end, skip creating a track
-        if start == end:
-            self.logger.debug(f"Skipping zero-length track from {start} to {end}")
-            return
+        # Round to integer units up front: wxPoint accepts floats but
+        # KiCad re-coerces them on the SWIG side, and plain truncation
+        # would bias the endpoints.
+        ex = np.rint(ex).astype(np.int64)
+        ey = np.rint(ey).astype(np.int64)
+
+        # Drop zero-length fanouts with one vectorized mask instead of
+        # comparing start and end per call inside add_track.
+        keep = (ex != self.pad_x) | (ey != self.pad_y)
+        dropped = len(keep) - int(keep.sum())
+        if dropped:
+            self.logger.debug("Skipping %d zero-length fanout(s)", dropped)
+
+        add_track = self.add_track
+        add_via = self.add_via
+        wxPoint = pcbnew.wxPoint
+        nets = self.pad_net
+        starts = self.pad_pos
+        for i in np.flatnonzero(keep):
+            end = wxPoint(int(ex[i]), int(ey[i]))
+            add_track(nets[i], starts[i], end)
+            add_via(nets[i], end)
 
+    def add_track(self, net, start, end):
+        """
+        Add a track from 'start' to 'end'. Zero-length candidates are
+        already filtered out by add_fanout's endpoint mask.
+        """
         track = pcbnew.PCB_TRACK(self.board)
-        if self.get_major_version() == '7':
+        if self._is_v7:
             track.SetStart(pcbnew.VECTOR2I(start))
             track.SetEnd(pcbnew.VECTOR2I(end))
         else:
@@ -625,13 +603,17 @@ class BGA:
         track.SetWidth(self.track)
         track.SetLayer(pcbnew.F_Cu)
         track.SetNetCode(net)
-        self.board.Add(track)
-        self.tracks.append(track)
+        if self._commit is not None:
+            self._commit.Add(track)
+        else:
+            self.board.Add(track)
+        self.tracks[self._tracks_idx] = track
+        self._tracks_idx += 1
 
     def add_via(self, net, pos):
         via = pcbnew.PCB_VIA(self.board)
         via.SetViaType(pcbnew.VIATYPE_THROUGH)
-        if self.get_major_version() == '7':
+        if self._is_v7:
             via.SetPosition(pcbnew.VECTOR2I(pos))
         else:
             via.SetPosition(pos)
@@ -639,13 +621,18 @@ class BGA:
         via.SetWidth(int(self.via.m_Diameter))
         via.SetDrill(self.via.m_Drill)
         via.SetNetCode(net)
-        self.board.Add(via)
-        self.tracks.append(via)
+        if self._commit is not None:
+            self._commit.Add(via)
+        else:
+            self.board.Add(via)
+        self.tracks[self._tracks_idx] = via
+        self._tracks_idx += 1
 
     def remove_track_via(self):
         self.logger.debug("Removing tracks & vias created by the fanout tool...")
         for item in self.tracks:
             self.board.Remove(item)
         self.tracks.clear()
+        self._tracks_idx = 0
         pcbnew.Refresh()
         self.logger.debug("Tracks & vias removed.")